@@ -0,0 +1,156 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Optionale C-Beschleunigung für huffman.py.
+
+Bauen mit: cythonize -i _huffman_c.pyx
+Ist das Modul nicht gebaut, nutzt huffman.py die reinen Python-Pfade.
+"""
+from cpython.mem cimport PyMem_Malloc, PyMem_Free
+from libc.stdint cimport int32_t, uint8_t, uint64_t
+
+cdef extern from "Python.h":
+    int PyUnicode_4BYTE_KIND
+    object PyUnicode_FromKindAndData(int kind, const void *buffer, Py_ssize_t size)
+
+
+def encode(str text, const uint64_t[:] code_value, const uint8_t[:] code_length, int max_length):
+    """
+    Encodiert einen Text in einen gepackten Bitpuffer (MSB-first).
+
+    Args:
+        text: Zu encodierender Text
+        code_value: Code je Codepoint
+        code_length: Codelänge je Codepoint (0 = Zeichen nicht im Baum)
+        max_length: Größte Codelänge (maximal 56)
+
+    Returns:
+        Tupel (data, nbits)
+
+    Raises:
+        ValueError: Wenn ein Zeichen nicht im Baum vorhanden ist
+    """
+    cdef Py_ssize_t table_size = code_length.shape[0]
+    cdef Py_ssize_t pos = 0
+    cdef Py_ssize_t total = 0
+    cdef uint64_t reg = 0
+    cdef int bits = 0
+    cdef int nbits
+    cdef Py_UCS4 char
+
+    out = bytearray((len(text) * max_length + 7) >> 3)
+    cdef unsigned char *buf = out
+
+    for char in text:
+        if char >= table_size or code_length[char] == 0:
+            raise ValueError(f"Zeichen '{char}' ist nicht im Huffman-Baum enthalten")
+        nbits = code_length[char]
+        reg = (reg << nbits) | code_value[char]
+        bits += nbits
+        total += nbits
+        while bits >= 8:
+            bits -= 8
+            buf[pos] = (reg >> bits) & 0xFF
+            pos += 1
+        reg &= (<uint64_t>1 << bits) - 1
+
+    if bits:
+        buf[pos] = (reg << (8 - bits)) & 0xFF
+        pos += 1
+
+    return bytes(out[:pos]), total
+
+
+def decode(const uint8_t[:] data, Py_ssize_t nbits, int min_length, int table_bits, const uint8_t[:] tab_count,
+           const uint8_t[:] tab_used, const int32_t[:] tab_node, const int32_t[:] tab_chars,
+           const int32_t[:] left, const int32_t[:] right, const int32_t[:] leaf_codepoint):
+    """
+    Decodiert einen gepackten Bitpuffer über die von der Wurzel aus indizierte Lookup-Tabelle.
+
+    Eintrag p (die nächsten table_bits Bits) liefert die Anzahl vollständig
+    decodierter Zeichen, die verbrauchten Bits und ab tab_chars[p * table_bits]
+    deren Codepoints. Bei 0 verbrauchten Bits ist der Code länger als
+    table_bits und wird ab tab_node[p] über den flachen Baum zu Ende gelaufen,
+    ebenso die letzten weniger als table_bits Bits.
+
+    Args:
+        data: Bytes mit den Bits MSB-first
+        nbits: Anzahl gültiger Bits in data (vom Aufrufer geprüft)
+        min_length: Kürzeste Codelänge, bestimmt die Größe des Ausgabepuffers
+        table_bits: Bitbreite der Tabelle (höchstens 24)
+        tab_count: Anzahl decodierter Zeichen je Eintrag
+        tab_used: Verbrauchte Bits je Eintrag, 0 bei langen Codes
+        tab_node: Innerer Knoten nach table_bits Bits bei langen Codes
+        tab_chars: Codepoints, table_bits Plätze je Eintrag
+        left: Linke Kind-IDs
+        right: Rechte Kind-IDs
+        leaf_codepoint: Codepoint je Blatt, -1 bei inneren Knoten
+
+    Returns:
+        Tupel (text, node): decodierter Text und Knoten-ID, bei der ein
+        unvollständiger letzter Code endet (0 = Wurzel)
+    """
+    cdef Py_UCS4 *out = <Py_UCS4 *> PyMem_Malloc((nbits // min_length + 1) * sizeof(Py_UCS4))
+    cdef Py_ssize_t nbytes = data.shape[0]
+    cdef Py_ssize_t i = 0
+    cdef Py_ssize_t k = 0
+    cdef Py_ssize_t byte_pos
+    cdef Py_ssize_t entry
+    cdef uint64_t window
+    cdef uint64_t mask = (<uint64_t>1 << table_bits) - 1
+    cdef int j
+    cdef int count
+    cdef int used
+    cdef int32_t node = 0
+    cdef int32_t codepoint
+
+    if out is NULL:
+        raise MemoryError()
+
+    try:
+        while nbits - i >= table_bits:
+            byte_pos = i >> 3
+            window = 0
+            for j in range(4):
+                window <<= 8
+                if byte_pos + j < nbytes:
+                    window |= data[byte_pos + j]
+            entry = (window >> (32 - table_bits - (i & 7))) & mask
+            used = tab_used[entry]
+            if used:
+                count = tab_count[entry]
+                for j in range(count):
+                    out[k + j] = tab_chars[entry * table_bits + j]
+                k += count
+                i += used
+                continue
+
+            node = tab_node[entry]
+            i += table_bits
+            while i < nbits:
+                if (data[i >> 3] >> (7 - (i & 7))) & 1:
+                    node = right[node]
+                else:
+                    node = left[node]
+                i += 1
+                codepoint = leaf_codepoint[node]
+                if codepoint >= 0:
+                    out[k] = codepoint
+                    k += 1
+                    node = 0
+                    break
+            if node:
+                return PyUnicode_FromKindAndData(PyUnicode_4BYTE_KIND, out, k), node
+
+        for i in range(i, nbits):
+            if (data[i >> 3] >> (7 - (i & 7))) & 1:
+                node = right[node]
+            else:
+                node = left[node]
+            codepoint = leaf_codepoint[node]
+            if codepoint >= 0:
+                out[k] = codepoint
+                k += 1
+                node = 0
+        return PyUnicode_FromKindAndData(PyUnicode_4BYTE_KIND, out, k), node
+    finally:
+        PyMem_Free(out)
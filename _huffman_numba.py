@@ -0,0 +1,95 @@
+"""
+Optionaler Numba-Decoder für huffman.py.
+
+Wird von huffman.py erst beim ersten großen Packed-Decoding importiert, weil
+der Import von numba allein mehrere hundert Millisekunden kostet.
+"""
+from typing import Tuple
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def _decode_packed(buf, nbits, min_length, table_bits, tab_count, tab_used, tab_node, tab_chars, left, right, leaf_codepoint):
+    """
+    Numba-Kernel: decodiert nbits Bits aus buf über die von der Wurzel aus indizierte Tabelle.
+
+    Gibt die Codepoints und die Knoten-ID zurück, bei der ein unvollständiger
+    letzter Code endet (0 = Wurzel).
+    """
+    out = np.empty(nbits // min_length + 1, dtype=np.int32)
+    nbytes = buf.shape[0]
+    mask = (1 << table_bits) - 1
+    k = 0
+    i = 0
+    node = 0
+    while nbits - i >= table_bits:
+        byte_pos = i >> 3
+        window = 0
+        for j in range(4):
+            window <<= 8
+            if byte_pos + j < nbytes:
+                window |= buf[byte_pos + j]
+        entry = (window >> (32 - table_bits - (i & 7))) & mask
+        used = tab_used[entry]
+        if used:
+            count = tab_count[entry]
+            base = entry * table_bits
+            for j in range(count):
+                out[k + j] = tab_chars[base + j]
+            k += count
+            i += used
+            continue
+
+        node = tab_node[entry]
+        i += table_bits
+        while i < nbits:
+            if (buf[i >> 3] >> (7 - (i & 7))) & 1:
+                node = right[node]
+            else:
+                node = left[node]
+            i += 1
+            if leaf_codepoint[node] >= 0:
+                out[k] = leaf_codepoint[node]
+                k += 1
+                node = 0
+                break
+        if node:
+            return out[:k], node
+
+    for i in range(i, nbits):
+        if (buf[i >> 3] >> (7 - (i & 7))) & 1:
+            node = right[node]
+        else:
+            node = left[node]
+        if leaf_codepoint[node] >= 0:
+            out[k] = leaf_codepoint[node]
+            k += 1
+            node = 0
+    return out[:k], node
+
+
+def build_arrays(flat_table: Tuple, left, right, leaf_codepoint) -> tuple:
+    """Erstellt die numpy-Arrays für den Kernel aus der flachen Tabelle und dem flachen Baum."""
+    tab_count, tab_used, tab_node, tab_chars = flat_table
+    return (
+        np.asarray(tab_count, dtype=np.int64),
+        np.asarray(tab_used, dtype=np.int64),
+        np.asarray(tab_node, dtype=np.int32),
+        np.asarray(tab_chars, dtype=np.int32),
+        np.asarray(left, dtype=np.int32),
+        np.asarray(right, dtype=np.int32),
+        np.asarray(leaf_codepoint, dtype=np.int32),
+    )
+
+
+def decode(data: bytes, nbits: int, min_length: int, table_bits: int, arrays: Tuple) -> Tuple[str, int]:
+    """
+    Decodiert nbits Bits aus data mit den Arrays aus build_arrays; Rückgabe (text, node).
+
+    min_length ist die kürzeste Codelänge und bestimmt die Größe des Ausgabepuffers.
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    codepoints, node = _decode_packed(buf, nbits, min_length, table_bits, *arrays)
+    return codepoints.astype('<u4').tobytes().decode('utf-32-le', 'surrogatepass'), int(node)
@@ -1,6 +1,71 @@
+import json
+
+import huffman
 from huffman import HuffmanTree
 
 
+def decoder_backends(tree):
+    """Liefert die für den Baum verfügbaren Pfade von _decode_bits als (Name, Funktion)."""
+    backends = [
+        ("Bitweise", tree._decode_bits_walk),
+        ("Python-Byte-Tabelle", tree._decode_bits_lut),
+        ("Python-Wurzeltabelle", tree._decode_bits_table),
+    ]
+    if tree._codepoint_leaves and huffman._huffman_c is not None:
+        backends.append(("C", tree._decode_bits_c))
+    numba_decoder = huffman._load_numba_decoder() if tree._codepoint_leaves else None
+    if numba_decoder is not None:
+        backends.append(("Numba", lambda data, nbits: tree._decode_bits_numba(data, nbits, numba_decoder)))
+    return backends
+
+
+def check_decoders(tree, text):
+    """
+    Vergleicht alle Decoder-Pfade mit dem Bit-für-Bit-Decoding über decode().
+
+    Für jede Schnittstelle im Bitstring müssen Text und Endknoten (_cur) mit
+    decode() übereinstimmen; decode_text wird zusätzlich über die Tabellen geprüft.
+
+    Returns:
+        Liste der Namen der Pfade, die abweichen
+    """
+    encoded = tree.encode_text(text)
+    data, nbits = tree.encode_text_packed(text)
+    expected = (int(encoded, 2) << (-nbits % 8)).to_bytes((nbits + 7) // 8, 'big') if nbits else b''
+    if data != expected:
+        return ["encode_text_packed"]
+
+    # Referenz: Anzahl decodierter Zeichen und Knoten-ID nach jedem Bit.
+    tree.reset_decoder()
+    reference = [(0, 0)]
+    count = 0
+    for bit in encoded:
+        ok, _ = tree.decode(bit)
+        count += ok
+        reference.append((count, tree._cur))
+
+    failed = []
+    for name, decode_bits in decoder_backends(tree):
+        for cut in range(nbits + 1):
+            count, node = reference[cut]
+            if decode_bits(data[:(cut + 7) // 8], cut) != (text[:count], node):
+                failed.append(name)
+                break
+
+    table_min_bits = huffman._TABLE_MIN_BITS
+    huffman._TABLE_MIN_BITS = 0
+    try:
+        for cut in range(nbits + 1):
+            count, node = reference[cut]
+            if tree.decode_text(encoded[:cut]) != text[:count] or tree._cur != node:
+                failed.append("decode_text")
+                break
+    finally:
+        huffman._TABLE_MIN_BITS = table_min_bits
+    tree.reset_decoder()
+    return failed
+
+
 def main():
     print("=== Huffman-Baum Demo ===\n")
 
@@ -20,7 +85,7 @@ def main():
     print(f"Kompressionsrate: {len(encoded) / (len(text) * 8) * 100:.1f}%\n")
 
     print("=== Einzelnes Encoding ===")
-    for char in set(text):
+    for char in tree.code_table:
         code = tree.encode(char)
         print(f"'{char}' -> {code}")
     print()
@@ -38,7 +103,33 @@ def main():
 
     decoded_text = ''.join(decoded_chars)
     print(f"\nDecodierter Text: {decoded_text}")
-    print(f"Korrekt: {decoded_text == text}")
+    print(f"Korrekt: {decoded_text == text}\n")
+
+    print("=== Serialisierung (kanonische Codelängen) ===")
+    serialized = json.dumps(tree.get_code_lengths(), ensure_ascii=False)
+    print(f"JSON: {serialized}")
+
+    restored = HuffmanTree()
+    restored.build_from_code_lengths(json.loads(serialized))
+    restored_text = restored.decode_text(encoded)
+    print(f"Decodiert mit wiederhergestelltem Baum: {restored_text}")
+    print(f"Korrekt: {restored_text == text}\n")
+
+    print("=== Abgleich der Decoder ===")
+    # Fibonacci-Häufigkeiten erzeugen Codes länger als die Tabellenbreite.
+    fibonacci = [1, 1]
+    while len(fibonacci) < 20:
+        fibonacci.append(fibonacci[-1] + fibonacci[-2])
+    long_codes = HuffmanTree()
+    long_codes.build_from_frequencies({chr(ord('a') + i): freq for i, freq in enumerate(fibonacci)})
+    long_text = ''.join(long_codes.code_table) * 3 + "aaabbt"
+
+    for name, check_tree, check_text in (("MISSISSIPPI", tree, text), ("Lange Codes", long_codes, long_text)):
+        backends = ", ".join(backend for backend, _ in decoder_backends(check_tree))
+        failed = check_decoders(check_tree, check_text)
+        print(f"{name} ({backends}): {'Abweichung in ' + ', '.join(failed) if failed else 'alle gleich'}")
+        if failed:
+            raise SystemExit(1)
 
 
 if __name__ == "__main__":
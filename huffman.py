@@ -1,10 +1,59 @@
 import heapq
-from typing import Dict, Tuple, Optional
+from array import array
+from collections import Counter
+from typing import Dict, List, Tuple, Optional
+
+try:
+    import _huffman_c
+except ImportError:
+    _huffman_c = None
+
+# Bitbreite des C-Schieberegisters (uint64) abzüglich eines angefangenen Bytes.
+_C_MAX_CODE_LENGTH = 56
+
+# Größte Codepoint-Tabelle für den C-Encoder (~1,1 MiB). Dünn besetzte Alphabete
+# mit höheren Codepoints encodieren über den Python-Pfad.
+_C_MAX_TABLE_SIZE = 1 << 17
+
+# Ab dieser Bitanzahl (8 MiB gepackt) wird der Numba-Decoder genutzt. Import
+# und Laden des Kernels kosten einmalig ~0,4 s, der Kernel spart gegenüber der
+# Python-LUT ~5 ns pro Bit; darunter bleibt es bei der LUT.
+_NUMBA_MIN_BITS = 1 << 26
+
+# Unterhalb dieser Bitanzahl wird ohne Lookup-Tabelle Bit für Bit decodiert,
+# damit kurze Eingaben nicht den Aufbau der Tabellen bezahlen.
+_TABLE_MIN_BITS = 1 << 16
+
+# Bitbreite der Lookup-Tabelle (2**_TABLE_BITS Einträge, unabhängig vom Alphabet).
+# Längere Codes werden ab dem Tabelleneintrag Bit für Bit zu Ende decodiert.
+_TABLE_BITS = 12
+
+# Bis zu dieser Zahl innerer Knoten (256 * 256 Einträge) nutzt der reine
+# Python-Pfad die schnellere Byte-Tabelle je Zustand, darüber die Tabelle ab der Wurzel.
+_LUT_MAX_STATES = 256
+
+# None: noch nicht versucht, False: numba/numpy nicht verfügbar, sonst das Modul.
+_numba_decoder = None
+
+
+def _load_numba_decoder():
+    """Importiert _huffman_numba beim ersten Bedarf; None, wenn numba fehlt."""
+    global _numba_decoder
+    if _numba_decoder is None:
+        try:
+            import _huffman_numba
+        except ImportError:
+            _numba_decoder = False
+        else:
+            _numba_decoder = _huffman_numba
+    return _numba_decoder or None
 
 
 class Node:
     """Repräsentiert einen Knoten im Huffman-Baum."""
 
+    __slots__ = ('freq', 'char', 'left', 'right')
+
     def __init__(self, freq: int, char: Optional[str] = None, left: Optional['Node'] = None, right: Optional['Node'] = None):
         self.freq = freq
         self.char = char
@@ -15,9 +64,12 @@ class Node:
         """Prüft, ob dieser Knoten ein Blatt ist."""
         return self.left is None and self.right is None
 
-    def __lt__(self, other: 'Node') -> bool:
-        """Vergleichsoperator für Priority Queue."""
-        return self.freq < other.freq
+
+class _CodeTranslation(dict):
+    """Übersetzungstabelle für str.translate, die bei unbekannten Zeichen abbricht."""
+
+    def __missing__(self, key: int) -> str:
+        raise ValueError(f"Zeichen '{chr(key)}' ist nicht im Huffman-Baum enthalten")
 
 
 class HuffmanTree:
@@ -26,14 +78,39 @@ class HuffmanTree:
     def __init__(self):
         self.root: Optional[Node] = None
         self.code_table: Dict[str, str] = {}
-        self.current_node: Optional[Node] = None
+        self._codes: Dict[str, Tuple[int, int]] = {}
+        self._translate_table = _CodeTranslation()
+        self._decode_lut: Optional[List[Optional[List[Tuple[str, int]]]]] = None
+        self._decode_table: Optional[List[Tuple[str, int, int]]] = None
+        self._jit_arrays: Optional[tuple] = None
+        # None: noch nicht erstellt, False: Codepoints zu groß für den C-Encoder.
+        self._c_tables = None
+        self._leaf_codepoints: Optional[array] = None
+        self._flat_table: Optional[tuple] = None
+        self._max_nbits = 0
+        self._min_nbits = 0
+        self._left = array('i')
+        self._right = array('i')
+        self._leaf_char: List[Optional[str]] = []
+        self._nodes: List[Node] = []
+        self._codepoint_leaves = False
+        self._cur = 0
 
     def build_from_frequencies(self, freq_dict: Dict[str, int]) -> None:
         """
         Baut den Huffman-Baum aus einem Häufigkeiten-Dictionary auf.
 
+        Aus dem Huffman-Baum werden nur die Codelängen übernommen; Codes und
+        Baum werden anschließend kanonisch neu aufgebaut (siehe
+        build_from_code_lengths).
+
         Args:
-            freq_dict: Dictionary mit Zeichen als Keys und Häufigkeiten als Values
+            freq_dict: Dictionary mit Zeichen als Keys und Häufigkeiten als Values.
+                Keys verschiedener Typen sind erlaubt, Keys gleichen Typs müssen
+                untereinander vergleichbar sein (z.B. str, int).
+
+        Raises:
+            ValueError: Wenn das Dictionary leer ist oder Keys nicht vergleichbar sind
         """
         if not freq_dict:
             raise ValueError("Häufigkeiten-Dictionary darf nicht leer sein")
@@ -42,23 +119,126 @@ class HuffmanTree:
             char = list(freq_dict.keys())[0]
             freq = freq_dict[char]
             self.root = Node(freq, char)
-            self.code_table = {char: "0"}
-            self.current_node = self.root
+            self._build_code_table()
+            self._flatten_tree()
+            return
+
+        if len(freq_dict) == 2:
+            self._build_canonical(dict.fromkeys(freq_dict, 1), freq_dict)
             return
 
-        priority_queue = [Node(freq, char) for char, freq in freq_dict.items()]
+        # Einträge (Häufigkeit, Tiebreaker, Knoten): verglichen wird per Tupel in C,
+        # der fortlaufende Tiebreaker macht die Reihenfolge bei Gleichstand deterministisch.
+        priority_queue = [(freq, i, Node(freq, char)) for i, (char, freq) in enumerate(freq_dict.items())]
         heapq.heapify(priority_queue)
+        counter = len(priority_queue)
 
         while len(priority_queue) > 1:
-            left = heapq.heappop(priority_queue)
-            right = heapq.heappop(priority_queue)
+            freq1, _, left = heapq.heappop(priority_queue)
+            freq2, _, right = heapq.heappop(priority_queue)
 
-            parent = Node(left.freq + right.freq, left=left, right=right)
-            heapq.heappush(priority_queue, parent)
+            parent = Node(freq1 + freq2, left=left, right=right)
+            heapq.heappush(priority_queue, (freq1 + freq2, counter, parent))
+            counter += 1
 
-        self.root = priority_queue[0]
-        self.current_node = self.root
+        lengths = {}
+        stack = [(priority_queue[0][2], 0)]
+        while stack:
+            node, depth = stack.pop()
+            if node.is_leaf():
+                lengths[node.char] = depth
+            else:
+                stack.append((node.right, depth + 1))
+                stack.append((node.left, depth + 1))
+
+        self._build_canonical(lengths, freq_dict)
+
+    def build_from_code_lengths(self, lengths: Dict[str, int]) -> None:
+        """
+        Baut den Baum aus den Codelängen eines kanonischen Huffman-Codes auf.
+
+        Die Zeichen werden nach (Länge, Zeichen) sortiert und erhalten
+        fortlaufende Codes. Damit genügen die Längen aus get_code_lengths, um
+        Codes und Baum exakt zu rekonstruieren. Die Häufigkeiten im Baum sind
+        dabei 0.
+
+        Args:
+            lengths: Dictionary mit Zeichen als Keys und Codelängen als Values;
+                Keys gleichen Typs müssen untereinander vergleichbar sein
+
+        Raises:
+            ValueError: Wenn die Längen keinen vollständigen Präfixcode ergeben
+                oder Keys nicht vergleichbar sind
+        """
+        if not lengths:
+            raise ValueError("Codelängen-Dictionary darf nicht leer sein")
+        if any(length < 1 for length in lengths.values()):
+            raise ValueError("Codelängen müssen mindestens 1 sein")
+
+        if len(lengths) == 1:
+            char, length = next(iter(lengths.items()))
+            if length != 1:
+                raise ValueError(f"Einzelnes Zeichen muss Codelänge 1 haben, erhalten: {length}")
+            self.root = Node(0, char)
+            self._build_code_table()
+            self._flatten_tree()
+            return
+
+        max_length = max(lengths.values())
+        if sum(1 << (max_length - length) for length in lengths.values()) != 1 << max_length:
+            raise ValueError("Codelängen ergeben keinen vollständigen Präfixcode")
+
+        self._build_canonical(lengths, {})
+
+    def _build_canonical(self, lengths: Dict[str, int], freq_dict: Dict[str, int]) -> None:
+        """
+        Weist kanonische Codes zu und baut Baum, Code-Tabelle und Arrays daraus auf.
+
+        Args:
+            lengths: Codelängen je Zeichen (vollständiger Präfixcode)
+            freq_dict: Häufigkeiten je Zeichen für die Knoten; fehlende Zeichen zählen 0
+        """
+        root = Node(0)
+        code = 0
+        prev_length = 0
+
+        # Gemischte Schlüsseltypen (z.B. str und int) werden zuerst nach Typ
+        # gruppiert; für reine str-Schlüssel entspricht das der Ordnung (Länge, Zeichen).
+        try:
+            ordered = sorted(lengths.items(), key=lambda item: (
+                item[1], type(item[0]).__module__, type(item[0]).__qualname__, item[0]
+            ))
+        except TypeError:
+            raise ValueError("Zeichen gleichen Typs müssen untereinander vergleichbar sein") from None
+
+        for char, length in ordered:
+            code <<= length - prev_length
+            prev_length = length
+
+            freq = freq_dict.get(char, 0)
+            node = root
+            node.freq += freq
+            for shift in range(length - 1, 0, -1):
+                if (code >> shift) & 1:
+                    if node.right is None:
+                        node.right = Node(0)
+                    node = node.right
+                else:
+                    if node.left is None:
+                        node.left = Node(0)
+                    node = node.left
+                node.freq += freq
+
+            leaf = Node(freq, char)
+            if code & 1:
+                node.right = leaf
+            else:
+                node.left = leaf
+            code += 1
+
+        self.root = root
         self._build_code_table()
+        self._flatten_tree()
 
     def build_from_text(self, text: str) -> None:
         """
@@ -70,27 +250,222 @@ class HuffmanTree:
         if not text:
             raise ValueError("Text darf nicht leer sein")
 
-        freq_dict = {}
-        for char in text:
-            freq_dict[char] = freq_dict.get(char, 0) + 1
-
-        self.build_from_frequencies(freq_dict)
+        self.build_from_frequencies(Counter(text))
 
     def _build_code_table(self) -> None:
-        """Erstellt die Code-Tabelle durch Baum-Traversierung."""
-        self.code_table = {}
+        """
+        Erstellt die Code-Tabelle durch Baum-Traversierung.
+
+        Die Codes werden intern als (Wert, Bitlänge) aufgebaut, der Pfad wird
+        per Shift erweitert statt per String-Konkatenation. Die Traversierung
+        nutzt einen expliziten Stack statt Rekursion. Die Bitstrings in
+        code_table werden daraus einmalig abgeleitet.
+        """
+        self._codes = {}
+        stack = [(self.root, 0, 0)]
 
-        def traverse(node: Optional[Node], code: str) -> None:
+        while stack:
+            node, code, nbits = stack.pop()
             if node is None:
-                return
+                continue
 
             if node.is_leaf():
-                self.code_table[node.char] = code if code else "0"
+                self._codes[node.char] = (code, nbits) if nbits else (0, 1)
             else:
-                traverse(node.left, code + "0")
-                traverse(node.right, code + "1")
+                stack.append((node.right, (code << 1) | 1, nbits + 1))
+                stack.append((node.left, code << 1, nbits + 1))
+        self.code_table = {char: format(code, f'0{nbits}b') for char, (code, nbits) in self._codes.items()}
+        self._max_nbits = max(nbits for _, nbits in self._codes.values())
+        self._min_nbits = min(nbits for _, nbits in self._codes.values())
+        # Nur Schlüssel aus genau einem Zeichen können im Text vorkommen; längere
+        # Schlüssel sind weiterhin über encode() erreichbar.
+        self._translate_table = _CodeTranslation(str.maketrans({
+            char: code for char, code in self.code_table.items()
+            if isinstance(char, str) and len(char) == 1
+        }))
+
+    def _flatten_tree(self) -> None:
+        """
+        Legt den Baum für das Decoding als parallele Integer-Arrays ab.
+
+        Die Knoten werden in Breitensuche nummeriert (Wurzel = 0). _left und
+        _right enthalten die Kind-IDs (-1 bei Blättern), _leaf_char das
+        Zeichen eines Blattes (None bei inneren Knoten). Der Node-Baum in root
+        bleibt für andere Verwender erhalten; _nodes ordnet die IDs den Knoten zu.
+        _codepoint_leaves gibt an, ob alle Blätter einzelne Zeichen sind und der
+        Baum damit für die Codepoint-Decoder taugt.
+        """
+        nodes = [self.root]
+        left = array('i')
+        right = array('i')
+        leaf_char: List[Optional[str]] = []
 
-        traverse(self.root, "")
+        for node in nodes:
+            if node.is_leaf():
+                left.append(-1)
+                right.append(-1)
+                leaf_char.append(node.char)
+            else:
+                left.append(len(nodes))
+                nodes.append(node.left)
+                right.append(len(nodes))
+                nodes.append(node.right)
+                leaf_char.append(None)
+
+        self._left = left
+        self._right = right
+        self._leaf_char = leaf_char
+        self._nodes = nodes
+        self._codepoint_leaves = all(
+            isinstance(char, str) and len(char) == 1 for char in leaf_char if char is not None
+        )
+        self._cur = 0
+        self._decode_lut = None
+        self._decode_table = None
+        self._jit_arrays = None
+        self._c_tables = None
+        self._leaf_codepoints = None
+        self._flat_table = None
+
+    def _build_decode_lut(self) -> None:
+        """
+        Erstellt die Byte-Lookup-Tabelle je Zustand für den reinen Python-Pfad.
+
+        Zustände sind die IDs der inneren Knoten aus _flatten_tree. Für jeden
+        Zustand und jedes Eingabebyte enthält die Tabelle die dabei vollständig
+        decodierten Zeichen und den Folgezustand. Die 8-Bit-Tabelle entsteht
+        aus der 1-Bit-Tabelle durch dreimaliges Verdoppeln (1 -> 2 -> 4 -> 8 Bit)
+        statt durch Simulation aller 256 Bitfolgen je Zustand.
+        """
+        leaf_char = self._leaf_char
+
+        def step(child: int) -> Tuple[str, int]:
+            char = leaf_char[child]
+            if char is not None:
+                return (char, 0)
+            return ('', child)
+
+        table = [
+            None if char is not None else [step(left), step(right)]
+            for left, right, char in zip(self._left, self._right, leaf_char)
+        ]
+        width = 1
+        while width < 8:
+            table = [
+                None if row is None else
+                [(hi_chars + lo_chars, lo_state)
+                 for hi_chars, hi_state in row
+                 for lo_chars, lo_state in table[hi_state]]
+                for row in table
+            ]
+            width *= 2
+
+        self._decode_lut = table
+
+    def _build_decode_table(self) -> None:
+        """
+        Erstellt die von der Wurzel aus indizierte Lookup-Tabelle für _decode_bits.
+
+        Eintrag p (die nächsten _TABLE_BITS Bits) enthält alle Zeichen, deren
+        Codes vollständig in p liegen, und die Anzahl der dabei verbrauchten Bits.
+        Beginnt p mit einem Code, der länger als _TABLE_BITS ist, sind es keine
+        Zeichen, 0 Bits und der innere Knoten nach _TABLE_BITS Bits, ab dem
+        Bit für Bit weiterdecodiert wird. Die Größe hängt nur von _TABLE_BITS
+        ab, nicht vom Alphabet. Die Tabelle für w Bits entsteht aus dem ersten
+        Code in w und der Tabelle für die übrigen w - Codelänge Bits.
+        """
+        table_bits = _TABLE_BITS
+        size = 1 << table_bits
+        first_char = [''] * size
+        first_len = [0] * size
+        for char, (code, nbits) in self._codes.items():
+            if nbits <= table_bits:
+                span = 1 << (table_bits - nbits)
+                low = code << (table_bits - nbits)
+                first_char[low:low + span] = [char] * span
+                first_len[low:low + span] = [nbits] * span
+
+        tables = [[('', 0)]]
+        for width in range(1, table_bits + 1):
+            shift = table_bits - width
+            row = []
+            for prefix in range(1 << width):
+                length = first_len[prefix << shift]
+                if length == 0 or length > width:
+                    row.append(('', 0))
+                else:
+                    chars, used = tables[width - length][prefix & ((1 << (width - length)) - 1)]
+                    row.append((first_char[prefix << shift] + chars, length + used))
+            tables.append(row)
+
+        long_node = [0] * size
+        left = self._left
+        right = self._right
+        leaf_char = self._leaf_char
+        stack = [(0, 0, 0)]
+        while stack:
+            node_id, depth, prefix = stack.pop()
+            if leaf_char[node_id] is not None:
+                continue
+            if depth == table_bits:
+                long_node[prefix] = node_id
+                continue
+            stack.append((left[node_id], depth + 1, prefix << 1))
+            stack.append((right[node_id], depth + 1, (prefix << 1) | 1))
+
+        self._decode_table = [
+            (chars, used, node_id) for (chars, used), node_id in zip(tables[table_bits], long_node)
+        ]
+
+    def _build_flat_table(self) -> None:
+        """
+        Überträgt die Lookup-Tabelle in flache Integer-Arrays (für C und Numba).
+
+        Eintrag p enthält die Anzahl decodierter Zeichen (tab_count), die
+        verbrauchten Bits (tab_used, 0 bei langen Codes), den inneren Knoten für
+        lange Codes (tab_node) und die Codepoints ab tab_chars[p * _TABLE_BITS].
+        """
+        if self._decode_table is None:
+            self._build_decode_table()
+
+        count_list: List[int] = []
+        used_list: List[int] = []
+        node_list: List[int] = []
+        chars_list: List[int] = []
+        padding = (0,) * _TABLE_BITS
+
+        for chars, used, node_id in self._decode_table:
+            count_list.append(len(chars))
+            used_list.append(used)
+            node_list.append(node_id)
+            chars_list.extend(map(ord, chars))
+            chars_list.extend(padding[len(chars):])
+
+        self._flat_table = (
+            array('B', count_list), array('B', used_list), array('i', node_list), array('i', chars_list)
+        )
+
+    def _build_c_tables(self) -> None:
+        """
+        Erstellt die nach Codepoint indizierten Encoding-Tabellen für _huffman_c.
+
+        Reicht der größte Codepoint über _C_MAX_TABLE_SIZE hinaus, wird
+        _c_tables auf False gesetzt und encode_text_packed bleibt beim Python-Pfad.
+        """
+        size = max(map(ord, self._codes)) + 1
+        if size > _C_MAX_TABLE_SIZE:
+            self._c_tables = False
+            return
+        code_value = array('Q', [0]) * size
+        code_length = array('B', [0]) * size
+        for char, (code, nbits) in self._codes.items():
+            code_value[ord(char)] = code
+            code_length[ord(char)] = nbits
+        self._c_tables = (code_value, code_length)
+
+    def _build_leaf_codepoints(self) -> None:
+        """Erstellt den Codepoint je Knoten-ID (-1 bei inneren Knoten) für die Codepoint-Decoder."""
+        self._leaf_codepoints = array('i', [-1 if char is None else ord(char) for char in self._leaf_char])
 
     def encode(self, char: str) -> str:
         """
@@ -119,8 +494,56 @@ class HuffmanTree:
 
         Returns:
             Bitstring als String
+
+        Raises:
+            ValueError: Wenn ein Zeichen nicht im Baum vorhanden ist
+        """
+        return text.translate(self._translate_table)
+
+    def encode_text_packed(self, text: str) -> Tuple[bytes, int]:
+        """
+        Encodiert einen ganzen Text in einen gepackten Bitpuffer (8 Bits pro Byte).
+
+        Args:
+            text: Zu encodierender Text
+
+        Returns:
+            Tupel (data, nbits): Bytes mit den Bits MSB-first und Anzahl gültiger Bits.
+            Das letzte Byte ist ggf. mit Nullbits aufgefüllt.
+
+        Raises:
+            ValueError: Wenn ein Zeichen nicht im Baum vorhanden ist
         """
-        return ''.join(self.encode(char) for char in text)
+        if _huffman_c is not None and self._codepoint_leaves and self._max_nbits <= _C_MAX_CODE_LENGTH:
+            if self._c_tables is None:
+                self._build_c_tables()
+            if self._c_tables:
+                code_value, code_length = self._c_tables
+                return _huffman_c.encode(text, code_value, code_length, self._max_nbits)
+
+        buf = bytearray()
+        append = buf.append
+        get = self._codes.__getitem__
+        reg = 0
+        bits = 0
+        total = 0
+
+        try:
+            for code, nbits in map(get, text):
+                reg = (reg << nbits) | code
+                bits += nbits
+                total += nbits
+                while bits >= 8:
+                    bits -= 8
+                    append((reg >> bits) & 0xFF)
+                reg &= (1 << bits) - 1
+        except KeyError as e:
+            raise ValueError(f"Zeichen '{e.args[0]}' ist nicht im Huffman-Baum enthalten") from None
+
+        if bits:
+            append((reg << (8 - bits)) & 0xFF)
+
+        return bytes(buf), total
 
     def decode(self, bit: str) -> Tuple[bool, Optional[str]]:
         """
@@ -143,23 +566,33 @@ class HuffmanTree:
         if self.root is None:
             raise ValueError("Baum ist nicht initialisiert")
 
-        if self.current_node is None:
-            self.current_node = self.root
-
         if self.root.is_leaf():
             char = self.root.char
             return (True, char)
 
-        if bit == '0':
-            self.current_node = self.current_node.left
+        return self._step(ord(bit) - 48)
+
+    def _step(self, bit: int) -> Tuple[bool, Optional[str]]:
+        """
+        Decodiert ein einzelnes Bit ohne Prüfungen (Kern von decode).
+
+        Args:
+            bit: 0 oder 1; der Baum muss initialisiert sein und innere Knoten haben
+
+        Returns:
+            Tupel (ok, char) wie bei decode
+        """
+        if bit:
+            nxt = self._right[self._cur]
         else:
-            self.current_node = self.current_node.right
+            nxt = self._left[self._cur]
 
-        if self.current_node.is_leaf():
-            char = self.current_node.char
-            self.current_node = self.root
+        char = self._leaf_char[nxt]
+        if char is not None:
+            self._cur = 0
             return (True, char)
 
+        self._cur = nxt
         return (False, None)
 
     def decode_text(self, bitstring: str) -> str:
@@ -171,20 +604,261 @@ class HuffmanTree:
 
         Returns:
             Decodierter Text
+
+        Raises:
+            ValueError: Wenn der Bitstring andere Zeichen als '0' und '1' enthält
+                oder der Baum nicht initialisiert ist
         """
         self.reset_decoder()
+        if not bitstring:
+            return ''
+
+        invalid = bitstring.replace('0', '').replace('1', '')
+        if invalid:
+            raise ValueError(f"Bit muss '0' oder '1' sein, erhalten: '{invalid[0]}'")
+
+        if self.root is None:
+            raise ValueError("Baum ist nicht initialisiert")
+
+        if self.root.is_leaf():
+            return self.root.char * len(bitstring)
+
+        nbits = len(bitstring)
+        if nbits < _TABLE_MIN_BITS:
+            step = self._step
+            result = []
+
+            for bit in bitstring:
+                ok, char = step(ord(bit) - 48)
+                if ok:
+                    result.append(char)
+
+            return ''.join(result)
+
+        # Bitstring packen und wie decode_text_packed decodieren; der Endzustand
+        # bleibt wie beim bitweisen Decoding in _cur erhalten.
+        data = (int(bitstring, 2) << (-nbits % 8)).to_bytes((nbits + 7) >> 3, 'big')
+        text, self._cur = self._decode_bits(data, nbits)
+        return text
+
+    def decode_text_packed(self, data: bytes, nbits: int) -> str:
+        """
+        Decodiert einen gepackten Bitpuffer zu einem Text.
+
+        Args:
+            data: Bytes mit den Bits MSB-first, wie von encode_text_packed erzeugt
+            nbits: Anzahl gültiger Bits in data
+
+        Returns:
+            Decodierter Text
+
+        Raises:
+            ValueError: Wenn der Baum nicht initialisiert ist oder nbits nicht zu data passt
+        """
+        if self.root is None:
+            raise ValueError("Baum ist nicht initialisiert")
+        if nbits < 0 or nbits > len(data) * 8:
+            raise ValueError(f"Ungültige Bitanzahl {nbits} für {len(data)} Bytes")
+
+        if self.root.is_leaf():
+            return self.root.char * nbits
+
+        return self._decode_bits(data, nbits)[0]
+
+    def _decode_bits(self, data: bytes, nbits: int) -> Tuple[str, int]:
+        """
+        Decodiert gepackte Bits ab der Wurzel über den schnellsten verfügbaren Pfad.
+
+        Args:
+            data: Bytes mit den Bits MSB-first
+            nbits: Anzahl gültiger Bits (geprüft); der Baum hat innere Knoten
+
+        Returns:
+            Tupel (text, node): decodierter Text und Knoten-ID, bei der ein
+            unvollständiger letzter Code endet (0 = Wurzel)
+        """
+        if nbits < _TABLE_MIN_BITS:
+            return self._decode_bits_walk(data, nbits)
+        if _huffman_c is not None and self._codepoint_leaves:
+            return self._decode_bits_c(data, nbits)
+        if nbits >= _NUMBA_MIN_BITS and self._codepoint_leaves:
+            numba_decoder = _load_numba_decoder()
+            if numba_decoder is not None:
+                return self._decode_bits_numba(data, nbits, numba_decoder)
+        if len(self._codes) - 1 <= _LUT_MAX_STATES:
+            return self._decode_bits_lut(data, nbits)
+        return self._decode_bits_table(data, nbits)
+
+    def _decode_bits_walk(self, data: bytes, nbits: int) -> Tuple[str, int]:
+        """Pfad von _decode_bits ohne Vorberechnung, Bit für Bit über die flachen Arrays."""
+        result = []
+        state = self._walk_bits(data, 0, nbits, 0, result)
+        return ''.join(result), state
+
+    def _decode_bits_c(self, data: bytes, nbits: int) -> Tuple[str, int]:
+        """Pfad von _decode_bits über _huffman_c; setzt _codepoint_leaves voraus."""
+        if self._leaf_codepoints is None:
+            self._build_leaf_codepoints()
+        if self._flat_table is None:
+            self._build_flat_table()
+        return _huffman_c.decode(
+            data, nbits, self._min_nbits, _TABLE_BITS, *self._flat_table,
+            self._left, self._right, self._leaf_codepoints
+        )
+
+    def _decode_bits_numba(self, data: bytes, nbits: int, numba_decoder) -> Tuple[str, int]:
+        """Pfad von _decode_bits über _huffman_numba; setzt _codepoint_leaves voraus."""
+        if self._jit_arrays is None:
+            if self._leaf_codepoints is None:
+                self._build_leaf_codepoints()
+            if self._flat_table is None:
+                self._build_flat_table()
+            self._jit_arrays = numba_decoder.build_arrays(
+                self._flat_table, self._left, self._right, self._leaf_codepoints
+            )
+        return numba_decoder.decode(data, nbits, self._min_nbits, _TABLE_BITS, self._jit_arrays)
+
+    def _decode_bits_lut(self, data: bytes, nbits: int) -> Tuple[str, int]:
+        """Reiner Python-Pfad von _decode_bits über die Byte-Lookup-Tabelle."""
+        if self._decode_lut is None:
+            self._build_decode_lut()
+
+        lut = self._decode_lut
+        full_bytes = nbits >> 3
+        state = 0
         result = []
 
-        for bit in bitstring:
-            ok, char = self.decode(bit)
-            if ok:
+        for byte in data[:full_bytes]:
+            chars, state = lut[state][byte]
+            result.append(chars)
+
+        state = self._walk_bits(data, full_bytes * 8, nbits, state, result)
+        return ''.join(result), state
+
+    def _decode_bits_table(self, data: bytes, nbits: int) -> Tuple[str, int]:
+        """Reiner Python-Pfad von _decode_bits über die Lookup-Tabelle."""
+        if self._decode_table is None:
+            self._build_decode_table()
+
+        table = self._decode_table
+        table_bits = _TABLE_BITS
+        mask = (1 << table_bits) - 1
+        left = self._left
+        right = self._right
+        leaf_char = self._leaf_char
+        result = []
+        acc = 0
+        bits = 0
+        pos = 0
+        i = 0
+
+        while nbits - i >= table_bits:
+            while bits < table_bits:
+                acc = ((acc << 8) | data[pos]) & 0xFFFFFFFF
+                pos += 1
+                bits += 8
+            chars, used, node_id = table[(acc >> (bits - table_bits)) & mask]
+            if used:
+                result.append(chars)
+                bits -= used
+                i += used
+                continue
+
+            # Code länger als _TABLE_BITS: ab dem inneren Knoten Bit für Bit weiter.
+            i += table_bits
+            while i < nbits:
+                if (data[i >> 3] >> (7 - (i & 7))) & 1:
+                    node_id = right[node_id]
+                else:
+                    node_id = left[node_id]
+                i += 1
+                char = leaf_char[node_id]
+                if char is not None:
+                    result.append(char)
+                    node_id = 0
+                    break
+            if node_id:
+                return ''.join(result), node_id
+            pos = i >> 3
+            acc = 0
+            bits = 0
+            if i & 7:
+                bits = 8 - (i & 7)
+                acc = data[pos] & ((1 << bits) - 1)
+                pos += 1
+
+        state = self._walk_bits(data, i, nbits, 0, result)
+        return ''.join(result), state
+
+    def _walk_bits(self, data: bytes, start: int, stop: int, state: int, result: List[str]) -> int:
+        """
+        Läuft die Bits start..stop-1 aus data ohne Vorberechnung über die flachen Arrays.
+
+        Args:
+            data: Bytes mit den Bits MSB-first
+            start: Erste Bitposition
+            stop: Bitposition hinter dem letzten Bit
+            state: Knoten-ID, bei der begonnen wird
+            result: Liste, an die decodierte Zeichen angehängt werden
+
+        Returns:
+            Knoten-ID nach dem letzten Bit (0 = Wurzel)
+        """
+        left = self._left
+        right = self._right
+        leaf_char = self._leaf_char
+        for i in range(start, stop):
+            if (data[i >> 3] >> (7 - (i & 7))) & 1:
+                state = right[state]
+            else:
+                state = left[state]
+            char = leaf_char[state]
+            if char is not None:
                 result.append(char)
+                state = 0
+        return state
+
+    @property
+    def current_node(self) -> Optional[Node]:
+        """Aktueller Knoten des Decoders, None bei nicht initialisiertem Baum."""
+        if not self._nodes:
+            return None
+        return self._nodes[self._cur]
+
+    @current_node.setter
+    def current_node(self, node: Optional[Node]) -> None:
+        """
+        Setzt den Decoder auf einen Knoten des Baums; None oder root setzt ihn zurück.
+
+        Raises:
+            ValueError: Wenn der Knoten nicht zum Baum gehört
+        """
+        if node is None or node is self.root:
+            self._cur = 0
+            return
 
-        return ''.join(result)
+        for node_id, candidate in enumerate(self._nodes):
+            if candidate is node:
+                self._cur = node_id
+                return
+
+        raise ValueError("Knoten gehört nicht zum Huffman-Baum")
 
     def reset_decoder(self) -> None:
         """Setzt den Decoder-Zustand zurück zur Wurzel."""
-        self.current_node = self.root
+        self._cur = 0
+
+    def get_code_lengths(self) -> Dict[str, int]:
+        """
+        Gibt die Codelängen zurück.
+
+        Zusammen mit build_from_code_lengths reicht das zum Speichern und
+        Wiederherstellen des Baums.
+
+        Returns:
+            Dictionary mit Zeichen als Keys und Codelängen als Values
+        """
+        return {char: nbits for char, (_, nbits) in self._codes.items()}
 
     def get_code_table(self) -> Dict[str, str]:
         """